@@ -0,0 +1,115 @@
+"""
+Long-lived analysis process
+Reads requests from stdin (newline-delimited JSON, or length-prefixed
+binary frames) and writes one JSON result per line to stdout, so Node.js
+can spawn Python once and keep the interpreter, imports and JIT-compiled
+kernels warm
+"""
+
+import sys
+import json
+import struct
+import numpy as np
+
+# orjson is optional - faster encoder that also serialises numpy scalars
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+FRAME_COLUMNS = ('prices', 'highs', 'lows', 'volumes')
+
+# Requests up to this many points reuse buffers allocated once per process
+MAX_POINTS = 5000
+
+# Binary frames claiming more points than this are treated as a corrupt
+# header (e.g. a stray text line) rather than allocated
+MAX_FRAME_POINTS = 20 * MAX_POINTS
+
+def write_result(result):
+    """Write one result to stdout as a single JSON line"""
+    if ORJSON_AVAILABLE:
+        sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+    else:
+        sys.stdout.write(json.dumps(result) + '\n')
+    sys.stdout.flush()
+
+def _run(handler, load):
+    """Decode a request with `load`, run `handler` and write its result as one JSON line"""
+    try:
+        result = handler(load())
+    except Exception as e:
+        result = {
+            'success': False,
+            'error': f'Python analysis failed: {str(e)}'
+        }
+    write_result(result)
+
+def _load_json(line, columns):
+    """Parse one NDJSON request, copying its series into the preallocated `columns`"""
+    data = json.loads(line)
+    for row, name in zip(columns, FRAME_COLUMNS):
+        values = data.get(name)
+        if isinstance(values, list) and len(values) <= len(row):
+            view = row[:len(values)]
+            view[:] = values
+            data[name] = view
+    return data
+
+def serve(handler):
+    """Run `handler` on every NDJSON request until stdin is closed"""
+    columns = np.empty((len(FRAME_COLUMNS), MAX_POINTS))
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            _run(handler, lambda: _load_json(line, columns))
+
+def _read_into(stream, view):
+    """Fill `view` from `stream`, returning False on a clean EOF"""
+    filled = 0
+    while filled < len(view):
+        count = stream.readinto(view[filled:])
+        if not count:
+            if filled == 0:
+                return False
+            raise EOFError(f'Truncated frame: expected {len(view)} bytes, got {filled}')
+        filled += count
+    return True
+
+def _decode_frame(payload, n):
+    """Zero-copy numpy views of each column in a binary frame"""
+    return {
+        name: np.frombuffer(payload, dtype='<f8', count=n, offset=8 * n * i)
+        for i, name in enumerate(FRAME_COLUMNS)
+    }
+
+def serve_binary(handler):
+    """
+    Run `handler` on every binary frame until stdin is closed
+
+    Frame layout (little-endian): uint32 N, then N float64 each of
+    prices, highs, lows and volumes. Frames are read into a reused
+    buffer and passed to the handler as zero-copy numpy views; results
+    are still written as NDJSON.
+
+    N above MAX_FRAME_POINTS means the stream is corrupt or out of sync;
+    an error result is written and serving stops, since there is no way
+    to find the next frame boundary.
+    """
+    stdin = sys.stdin.buffer
+    header = bytearray(4)
+    frame = bytearray(8 * len(FRAME_COLUMNS) * MAX_POINTS)
+    while _read_into(stdin, memoryview(header)):
+        (n,) = struct.unpack('<I', header)
+        if n > MAX_FRAME_POINTS:
+            write_result({
+                'success': False,
+                'error': f'Python analysis failed: frame of {n} points exceeds {MAX_FRAME_POINTS} (corrupt header?)'
+            })
+            return
+        size = 8 * n * len(FRAME_COLUMNS)
+        payload = frame if size <= len(frame) else bytearray(size)
+        if size and not _read_into(stdin, memoryview(payload)[:size]):
+            raise EOFError('Truncated frame: missing payload')
+        _run(handler, lambda: _decode_frame(payload, n))
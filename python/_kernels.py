@@ -0,0 +1,322 @@
+"""
+Tail indicator kernels
+Compute only the final value of each indicator (TA-Lib compatible),
+without allocating N-length output arrays
+"""
+
+import numpy as np
+from _njit import njit
+
+@njit(cache=True)
+def rsi_multi_tail(prices, periods):
+    """
+    Last Wilder RSI for several periods from one shared diff of prices
+    
+    Returns one RSI per period (NaN where there is not enough data)
+    """
+    delta = prices[1:] - prices[:-1]
+    up = np.maximum(delta, 0.0)
+    down = np.maximum(-delta, 0.0)
+    n = len(delta)
+    out = np.full(len(periods), np.nan)
+    for j in range(len(periods)):
+        period = periods[j]
+        if n < period:
+            continue
+        avg_gain = up[:period].mean()
+        avg_loss = down[:period].mean()
+        for i in range(period, n):
+            avg_gain = (avg_gain * (period - 1) + up[i]) / period
+            avg_loss = (avg_loss * (period - 1) + down[i]) / period
+        total = avg_gain + avg_loss
+        out[j] = 100.0 * avg_gain / total if total != 0 else 0.0
+    return out
+
+@njit(cache=True)
+def sma_tail(prices, period):
+    """Last value of the Simple Moving Average"""
+    if len(prices) < period:
+        return np.nan
+    return prices[-period:].mean()
+
+@njit(cache=True)
+def ema_tail(prices, period):
+    """Last value of the EMA, seeded with the SMA of the first `period` prices"""
+    n = len(prices)
+    if n < period:
+        return np.nan
+    alpha = 2.0 / (period + 1)
+    ema = prices[:period].mean()
+    for i in range(period, n):
+        ema += alpha * (prices[i] - ema)
+    return ema
+
+@njit(cache=True)
+def macd_tail(prices, fast=12, slow=26, signal=9):
+    """Last (macd, signal, histogram) built from EMA fast/slow and an EMA of their spread"""
+    n = len(prices)
+    if n < slow + signal - 1:
+        return np.nan, np.nan, np.nan
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    # Both EMAs start at bar slow - 1 (TA-Lib aligns the fast one to the slow lookback)
+    ema_fast = prices[slow - fast:slow].mean()
+    ema_slow = prices[:slow].mean()
+    # Signal line is seeded with the mean of the first `signal` MACD values
+    signal_line = ema_fast - ema_slow
+    for i in range(slow, slow + signal - 1):
+        ema_fast += alpha_fast * (prices[i] - ema_fast)
+        ema_slow += alpha_slow * (prices[i] - ema_slow)
+        signal_line += ema_fast - ema_slow
+    signal_line /= signal
+    for i in range(slow + signal - 1, n):
+        ema_fast += alpha_fast * (prices[i] - ema_fast)
+        ema_slow += alpha_slow * (prices[i] - ema_slow)
+        signal_line += alpha_signal * ((ema_fast - ema_slow) - signal_line)
+    macd = ema_fast - ema_slow
+    return macd, signal_line, macd - signal_line
+
+@njit(cache=True)
+def bb_tail(prices, period=20, nbdev=2.0):
+    """Last (upper, middle, lower) Bollinger Bands using the population std"""
+    if len(prices) < period:
+        return np.nan, np.nan, np.nan
+    window = prices[-period:]
+    middle = window.mean()
+    band = nbdev * window.std()
+    return middle + band, middle, middle - band
+
+@njit(cache=True)
+def rolling_extrema_tail(highs, lows, period, count):
+    """
+    Rolling max of highs / min of lows for the last `count` windows
+    
+    Uses monotonic index deques over the last period + count - 1 bars,
+    so every bar is pushed and popped at most once
+    """
+    n = len(highs)
+    size = period + count - 1
+    max_idx = np.empty(size, np.int64)
+    min_idx = np.empty(size, np.int64)
+    max_head = max_tail = 0
+    min_head = min_tail = 0
+    high_max = np.empty(count)
+    low_min = np.empty(count)
+    for i in range(n - size, n):
+        while max_tail > max_head and highs[max_idx[max_tail - 1]] <= highs[i]:
+            max_tail -= 1
+        max_idx[max_tail] = i
+        max_tail += 1
+        while min_tail > min_head and lows[min_idx[min_tail - 1]] >= lows[i]:
+            min_tail -= 1
+        min_idx[min_tail] = i
+        min_tail += 1
+        # Drop the index that just slid out of the window
+        if max_idx[max_head] <= i - period:
+            max_head += 1
+        if min_idx[min_head] <= i - period:
+            min_head += 1
+        j = i - (n - count)
+        if j >= 0:
+            high_max[j] = highs[max_idx[max_head]]
+            low_min[j] = lows[min_idx[min_head]]
+    return high_max, low_min
+
+@njit(cache=True)
+def stoch_tail(highs, lows, closes, fastk_period=14, slowk_period=3, slowd_period=3):
+    """Last (slowk, slowd) of the Stochastic Oscillator with SMA smoothing"""
+    n = len(closes)
+    count = slowk_period + slowd_period - 1
+    if n < fastk_period + count - 1:
+        return np.nan, np.nan
+    # Raw %K for the last `count` bars
+    high_max, low_min = rolling_extrema_tail(highs, lows, fastk_period, count)
+    fastk = np.empty(count)
+    for j in range(count):
+        diff = high_max[j] - low_min[j]
+        fastk[j] = 100.0 * (closes[n - count + j] - low_min[j]) / diff if diff != 0 else 0.0
+    slowd = 0.0
+    slowk = 0.0
+    for j in range(slowd_period):
+        slowk = fastk[j:j + slowk_period].mean()
+        slowd += slowk
+    return slowk, slowd / slowd_period
+
+@njit(cache=True)
+def atr_tail(highs, lows, closes, period=14):
+    """Last Average True Range (Wilder smoothing, seeded with the mean of the first TRs)"""
+    n = len(closes)
+    if n <= period:
+        return np.nan
+    atr = 0.0
+    for i in range(1, n):
+        prev_close = closes[i - 1]
+        tr = max(highs[i] - lows[i], abs(highs[i] - prev_close), abs(lows[i] - prev_close))
+        if i <= period:
+            atr += tr / period
+        else:
+            atr = (atr * (period - 1) + tr) / period
+    return atr
+
+@njit(cache=True)
+def adx_tail(highs, lows, closes, period=14):
+    """Last Average Directional Index (Wilder smoothing of +DM/-DM/TR and DX)"""
+    n = len(closes)
+    if n < 2 * period:
+        return np.nan
+    plus_dm = 0.0
+    minus_dm = 0.0
+    tr_sum = 0.0
+    dx_sum = 0.0
+    adx = 0.0
+    for i in range(1, n):
+        diff_p = highs[i] - highs[i - 1]
+        diff_m = lows[i - 1] - lows[i]
+        prev_close = closes[i - 1]
+        tr = max(highs[i] - lows[i], abs(highs[i] - prev_close), abs(lows[i] - prev_close))
+        if i >= period:
+            plus_dm -= plus_dm / period
+            minus_dm -= minus_dm / period
+            tr_sum -= tr_sum / period
+        if diff_m > 0 and diff_p < diff_m:
+            minus_dm += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            plus_dm += diff_p
+        tr_sum += tr
+        if i < period or abs(tr_sum) < 1e-8:
+            continue
+        plus_di = 100.0 * plus_dm / tr_sum
+        minus_di = 100.0 * minus_dm / tr_sum
+        di_sum = plus_di + minus_di
+        if abs(di_sum) < 1e-8:
+            continue
+        dx = 100.0 * abs(minus_di - plus_di) / di_sum
+        if i < 2 * period:
+            dx_sum += dx
+            if i == 2 * period - 1:
+                adx = dx_sum / period
+        else:
+            adx = (adx * (period - 1) + dx) / period
+    return adx
+
+@njit(cache=True)
+def obv_tail(closes, volumes):
+    """Last On Balance Volume"""
+    obv = volumes[0]
+    for i in range(1, len(closes)):
+        if closes[i] > closes[i - 1]:
+            obv += volumes[i]
+        elif closes[i] < closes[i - 1]:
+            obv -= volumes[i]
+    return obv
+
+@njit(cache=True)
+def willr_tail(highs, lows, closes, period=14):
+    """Last Williams %R"""
+    if len(closes) < period:
+        return np.nan
+    high_max = highs[-period:].max()
+    low_min = lows[-period:].min()
+    diff = high_max - low_min
+    return -100.0 * (high_max - closes[-1]) / diff if diff != 0 else 0.0
+
+@njit(cache=True)
+def cci_tail(highs, lows, closes, period=14):
+    """Last Commodity Channel Index"""
+    if len(closes) < period:
+        return np.nan
+    typical = (highs[-period:] + lows[-period:] + closes[-period:]) / 3.0
+    mean = typical.mean()
+    mean_dev = np.abs(typical - mean).mean()
+    return (typical[-1] - mean) / (0.015 * mean_dev) if mean_dev != 0 else 0.0
+
+@njit(cache=True)
+def mfi_tail(highs, lows, closes, volumes, period=14):
+    """Last Money Flow Index"""
+    n = len(closes)
+    if n <= period:
+        return np.nan
+    pos_flow = 0.0
+    neg_flow = 0.0
+    prev_typical = (highs[n - period - 1] + lows[n - period - 1] + closes[n - period - 1]) / 3.0
+    for i in range(n - period, n):
+        typical = (highs[i] + lows[i] + closes[i]) / 3.0
+        if typical > prev_typical:
+            pos_flow += typical * volumes[i]
+        elif typical < prev_typical:
+            neg_flow += typical * volumes[i]
+        prev_typical = typical
+    total = pos_flow + neg_flow
+    return 100.0 * pos_flow / total if total >= 1.0 else 0.0
+
+@njit(cache=True)
+def sar_tail(highs, lows, acceleration=0.02, maximum=0.2):
+    """Last Parabolic SAR (TA-Lib semantics: direction from the first bar's -DM)"""
+    n = len(highs)
+    if n < 2:
+        return np.nan
+    if acceleration > maximum:
+        acceleration = maximum
+    af = acceleration
+    diff_m = lows[0] - lows[1]
+    diff_p = highs[1] - highs[0]
+    is_long = not (diff_m > 0 and diff_p < diff_m)
+    if is_long:
+        ep = highs[1]
+        sar = lows[0]
+    else:
+        ep = lows[1]
+        sar = highs[0]
+    new_high = highs[1]
+    new_low = lows[1]
+    out = np.nan
+    for i in range(1, n):
+        prev_high = new_high
+        prev_low = new_low
+        new_high = highs[i]
+        new_low = lows[i]
+        if is_long:
+            if new_low <= sar:
+                # Reverse to short: SAR jumps to the extreme point
+                is_long = False
+                sar = max(ep, prev_high, new_high)
+                out = sar
+                af = acceleration
+                ep = new_low
+                sar = max(sar + af * (ep - sar), prev_high, new_high)
+            else:
+                out = sar
+                if new_high > ep:
+                    ep = new_high
+                    af = min(af + acceleration, maximum)
+                sar = min(sar + af * (ep - sar), prev_low, new_low)
+        else:
+            if new_high >= sar:
+                # Reverse to long
+                is_long = True
+                sar = min(ep, prev_low, new_low)
+                out = sar
+                af = acceleration
+                ep = new_high
+                sar = min(sar + af * (ep - sar), prev_low, new_low)
+            else:
+                out = sar
+                if new_low < ep:
+                    ep = new_low
+                    af = min(af + acceleration, maximum)
+                sar = max(sar + af * (ep - sar), prev_high, new_high)
+    return out
+
+def specialise(kernel, *params):
+    """
+    `kernel` with its trailing parameters fixed at import time
+    
+    The parameters become closure constants of the compiled wrapper, so
+    numba folds period-derived values (alphas, 1/period) and fixed-trip
+    loops into the specialised machine code
+    """
+    @njit(cache=True)
+    def _specialised(*series):
+        return kernel(*series, *params)
+    return _specialised
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build of the indicator kernels
+Run once at build time to produce the native `ta_kernels` extension next
+to this file, so requests never pay the first-call JIT compile:
+
+    python3 python/_kernels_aot.py
+
+The analysis scripts import `ta_kernels` when present and fall back to
+the @njit kernels otherwise. Requires numba.
+"""
+
+import os
+from numba.pycc import CC
+
+import simple_analysis
+import advanced_analysis
+
+cc = CC('ta_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+# CPU model to generate code for. Empty builds for generic x86-64 (no
+# AVX); set TA_KERNELS_CPU=x86-64-v3 (AVX2 + FMA) or 'host' when every
+# machine running the bot supports it
+cc.target_cpu = os.environ.get('TA_KERNELS_CPU', '')
+
+# Types are fixed (float64 arrays, int64 periods), so AOT loses nothing vs JIT
+EXPORTS = {
+    'advanced_compute_all': ('f8[:](f8[:], f8[:], f8[:], f8[:])', advanced_analysis.compute_all),
+    'simple_compute_all': ('UniTuple(f8, 16)(f8[:], f8[:], f8[:])', simple_analysis.compute_all),
+}
+
+for name, (signature, kernel) in EXPORTS.items():
+    cc.export(name, signature)(kernel.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
+    print(f'✅ Built {cc.output_file} in {cc.output_dir}')
@@ -0,0 +1,40 @@
+"""
+Optional Numba JIT support
+Exposes `njit` from numba when installed, otherwise a no-op decorator
+so the indicator kernels still run as plain Python/numpy
+"""
+
+import os
+import hashlib
+
+def _cache_dir(base):
+    """
+    Numba cache directory keyed on the source of every module here
+    
+    Numba validates an on-disk cache entry against the caller's own source
+    file only, so editing a kernel in _kernels.py would leave callers such
+    as compute_all running stale machine code; any edit now changes the key
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=8)
+    for name in sorted(os.listdir(here)):
+        if name.endswith('.py'):
+            with open(os.path.join(here, name), 'rb') as f:
+                digest.update(f.read())
+    return os.path.join(base or os.path.join(here, '__pycache__'), 'numba-' + digest.hexdigest())
+
+try:
+    from numba import njit, config
+    config.CACHE_DIR = _cache_dir(config.CACHE_DIR)
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports @njit and @njit(...))"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
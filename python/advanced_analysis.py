@@ -1,46 +1,121 @@
 #!/usr/bin/env python3
 """
 Advanced Technical Analysis Service
-Uses TA-Lib for professional-grade indicators (if available)
-Falls back to pandas/numpy if TA-Lib not installed
+TA-Lib compatible indicators computed by Numba kernels (see _kernels.py)
 Called by Node.js bot for enhanced analysis
 """
 
 import sys
 import json
+import hashlib
+from collections import OrderedDict
 import numpy as np
-import pandas as pd
-from scipy.signal import find_peaks
+from _daemon import serve, serve_binary, write_result
 
-# Try to import TA-Lib (optional)
+from _njit import njit
+from _kernels import (rsi_multi_tail, sma_tail, ema_tail, macd_tail, bb_tail,
+                      stoch_tail, adx_tail, atr_tail, obv_tail, willr_tail,
+                      cci_tail, mfi_tail, sar_tail, specialise)
+
+RSI_PERIODS = np.array([14, 7, 21], dtype=np.int64)
+
+# Flat record written by compute_all, one float64 field per indicator
+INDICATORS_DT = np.dtype([(name, np.float64) for name in (
+    'rsi_14', 'rsi_7', 'rsi_21', 'macd', 'macd_signal', 'macd_hist',
+    'bb_upper', 'bb_middle', 'bb_lower', 'adx', 'stoch_k', 'stoch_d',
+    'atr', 'obv', 'williams_r', 'cci', 'mfi', 'sma_20', 'sma_50', 'ema_12', 'ema_26', 'sar'
+)])
+
+# Field offsets (in float64 slots) for the kernel to write into
+(RSI_14, RSI_7, RSI_21, MACD, MACD_SIGNAL, MACD_HIST,
+ BB_UPPER, BB_MIDDLE, BB_LOWER, ADX, STOCH_K, STOCH_D,
+ ATR, OBV, WILLR, CCI, MFI, SMA_20, SMA_50, EMA_12, EMA_26, SAR) = range(len(INDICATORS_DT.names))
+NUM_OUTPUTS = len(INDICATORS_DT.names)
+
+# Indicator periods are fixed for this service, so each kernel is compiled
+# with its parameters as constants
+macd_12_26_9_tail = specialise(macd_tail, 12, 26, 9)
+bb_20_tail = specialise(bb_tail, 20, 2.0)
+adx_14_tail = specialise(adx_tail, 14)
+stoch_14_3_3_tail = specialise(stoch_tail, 14, 3, 3)
+atr_14_tail = specialise(atr_tail, 14)
+willr_14_tail = specialise(willr_tail, 14)
+cci_14_tail = specialise(cci_tail, 14)
+mfi_14_tail = specialise(mfi_tail, 14)
+sma_20_tail = specialise(sma_tail, 20)
+sma_50_tail = specialise(sma_tail, 50)
+ema_12_tail = specialise(ema_tail, 12)
+ema_26_tail = specialise(ema_tail, 26)
+sar_002_02_tail = specialise(sar_tail, 0.02, 0.2)
+
+# Recent results, most recently used last. In --serve mode the bot often
+# re-sends the same candle within seconds, so repeats skip the kernels
+RESULT_CACHE_SIZE = 256
+_result_cache = OrderedDict()
+
+# One bit per signal name so signal sets can be counted with popcount
+SIGNAL_BITS = {name: 1 << i for i, name in enumerate((
+    'RSI_OVERSOLD', 'RSI_OVERBOUGHT',
+    'MACD_BULLISH', 'MACD_BEARISH',
+    'BB_OVERSOLD', 'BB_OVERBOUGHT',
+    'STRONG_TREND', 'WEAK_TREND'
+))}
+BULLISH_MASK = SIGNAL_BITS['RSI_OVERSOLD'] | SIGNAL_BITS['MACD_BULLISH'] | SIGNAL_BITS['BB_OVERSOLD']
+BEARISH_MASK = SIGNAL_BITS['RSI_OVERBOUGHT'] | SIGNAL_BITS['MACD_BEARISH'] | SIGNAL_BITS['BB_OVERBOUGHT']
+
+@njit(cache=True)
+def compute_all(prices, highs, lows, volumes):
+    """
+    Last value of every kernel-backed indicator in a single JIT dispatch
+    
+    Returns a float64 vector laid out as one INDICATORS_DT record
+    """
+    out = np.empty(NUM_OUTPUTS)
+    rsi = rsi_multi_tail(prices, RSI_PERIODS)
+    out[RSI_14] = rsi[0]
+    out[RSI_7] = rsi[1]
+    out[RSI_21] = rsi[2]
+    out[MACD], out[MACD_SIGNAL], out[MACD_HIST] = macd_12_26_9_tail(prices)
+    out[BB_UPPER], out[BB_MIDDLE], out[BB_LOWER] = bb_20_tail(prices)
+    out[ADX] = adx_14_tail(highs, lows, prices)
+    out[STOCH_K], out[STOCH_D] = stoch_14_3_3_tail(highs, lows, prices)
+    out[ATR] = atr_14_tail(highs, lows, prices)
+    out[OBV] = obv_tail(prices, volumes)
+    out[WILLR] = willr_14_tail(highs, lows, prices)
+    out[CCI] = cci_14_tail(highs, lows, prices)
+    out[MFI] = mfi_14_tail(highs, lows, prices, volumes)
+    out[SMA_20] = sma_20_tail(prices)
+    out[SMA_50] = sma_50_tail(prices)
+    out[EMA_12] = ema_12_tail(prices)
+    out[EMA_26] = ema_26_tail(prices)
+    out[SAR] = sar_002_02_tail(highs, lows)
+    return out
+
+# Prefer the ahead-of-time compiled compute_all (built by _kernels_aot.py)
 try:
-    import talib
-    TALIB_AVAILABLE = True
+    from ta_kernels import advanced_compute_all as compute_all_native
 except ImportError:
-    TALIB_AVAILABLE = False
-    print("⚠️ TA-Lib not available, using pandas fallback", file=sys.stderr)
+    compute_all_native = compute_all
 
-def calculate_rsi_pandas(prices, period=14):
-    """Calculate RSI using pandas (fallback)"""
-    df = pd.DataFrame({'price': prices})
-    delta = df['price'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.values
+def _to_json(values):
+    """Indicator name -> Python float (NaN as None) for one compute_all record"""
+    record = values.view(INDICATORS_DT).item()
+    return {name: (None if value != value else value)
+            for name, value in zip(INDICATORS_DT.names, record)}
 
-def calculate_sma_pandas(prices, period=20):
-    """Calculate SMA using pandas"""
-    return pd.Series(prices).rolling(window=period).mean().values
-
-def calculate_ema_pandas(prices, period=12):
-    """Calculate EMA using pandas"""
-    return pd.Series(prices).ewm(span=period, adjust=False).mean().values
+def _cache_key(columns):
+    """
+    Identity of one request: the length plus a digest of every input series
+    (a forming candle keeps changing its close, so names/timestamps are not enough)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        digest.update(np.ascontiguousarray(column))
+    return (len(columns[0]), digest.digest())
 
 def calculate_advanced_indicators(data):
     """
-    Calculate advanced technical indicators using TA-Lib
+    Calculate advanced technical indicators
     
     Args:
         data: dict with 'prices', 'highs', 'lows', 'volumes'
@@ -49,156 +124,118 @@ def calculate_advanced_indicators(data):
         dict with advanced indicators
     """
     try:
-        prices = np.array(data.get('prices', []), dtype=float)
-        highs = np.array(data.get('highs', prices), dtype=float)
-        lows = np.array(data.get('lows', prices), dtype=float)
-        volumes = np.array(data.get('volumes', [1] * len(prices)), dtype=float)
+        prices = np.asarray(data.get('prices', []), dtype=float)
+        highs = np.asarray(data.get('highs', prices), dtype=float)
+        lows = np.asarray(data.get('lows', prices), dtype=float)
+        volumes = np.asarray(data.get('volumes', [1] * len(prices)), dtype=float)
         
         if len(prices) < 30:
             return {'error': 'Need at least 30 data points'}
         
-        # Advanced RSI (multiple periods)
-        if TALIB_AVAILABLE:
-            rsi_14 = talib.RSI(prices, timeperiod=14)
-            rsi_7 = talib.RSI(prices, timeperiod=7)
-            rsi_21 = talib.RSI(prices, timeperiod=21)
-        else:
-            rsi_14 = calculate_rsi_pandas(prices, 14)
-            rsi_7 = calculate_rsi_pandas(prices, 7)
-            rsi_21 = calculate_rsi_pandas(prices, 21)
+        # The kernels index every series up to len(prices) without bounds checks
+        if not len(highs) == len(lows) == len(volumes) == len(prices):
+            return {'success': False, 'error': 'prices, highs, lows and volumes must have the same length'}
         
-        # MACD (Moving Average Convergence Divergence)
-        macd, macd_signal, macd_hist = talib.MACD(prices, 
-                                                    fastperiod=12, 
-                                                    slowperiod=26, 
-                                                    signalperiod=9)
+        key = _cache_key((prices, highs, lows, volumes))
+        cached = _result_cache.get(key)
+        if cached is not None:
+            _result_cache.move_to_end(key)
+            return cached
         
-        # Bollinger Bands (multiple periods)
-        bb_upper, bb_middle, bb_lower = talib.BBANDS(prices, 
-                                                       timeperiod=20,
-                                                       nbdevup=2,
-                                                       nbdevdn=2)
+        # All kernel-backed indicators in one dispatch
+        values = compute_all_native(prices, highs, lows, volumes)
         
-        # ADX (Average Directional Index) - Trend strength
-        adx = talib.ADX(highs, lows, prices, timeperiod=14)
+        ind = _to_json(values)
         
-        # Stochastic Oscillator
-        slowk, slowd = talib.STOCH(highs, lows, prices,
-                                    fastk_period=14,
-                                    slowk_period=3,
-                                    slowd_period=3)
-        
-        # ATR (Average True Range) - Volatility
-        atr = talib.ATR(highs, lows, prices, timeperiod=14)
-        
-        # OBV (On Balance Volume) - Volume analysis
-        obv = talib.OBV(prices, volumes)
-        
-        # Williams %R
-        willr = talib.WILLR(highs, lows, prices, timeperiod=14)
-        
-        # CCI (Commodity Channel Index)
-        cci = talib.CCI(highs, lows, prices, timeperiod=14)
-        
-        # MFI (Money Flow Index) - Volume-weighted RSI
-        mfi = talib.MFI(highs, lows, prices, volumes, timeperiod=14)
-        
-        # Moving Averages
-        sma_20 = talib.SMA(prices, timeperiod=20)
-        sma_50 = talib.SMA(prices, timeperiod=50)
-        ema_12 = talib.EMA(prices, timeperiod=12)
-        ema_26 = talib.EMA(prices, timeperiod=26)
-        
-        # Parabolic SAR (Stop and Reverse)
-        sar = talib.SAR(highs, lows, acceleration=0.02, maximum=0.2)
-        
-        # Get latest values (last point)
-        def get_last(arr):
-            return float(arr[-1]) if len(arr) > 0 and not np.isnan(arr[-1]) else None
-        
-        # Detect divergences
-        price_peaks, _ = find_peaks(prices[-50:])
-        rsi_peaks, _ = find_peaks(rsi_14[-50:])
+        # Values read more than once below
+        current_price = prices[-1]
+        rsi_14 = ind['rsi_14']
+        macd_trend = 'BULLISH' if ind['macd'] > ind['macd_signal'] else 'BEARISH'
+        adx_value = ind['adx']
+        strong_trend = bool(adx_value) and adx_value > 25
+        bb_upper = ind['bb_upper']
+        bb_lower = ind['bb_lower']
+        stoch_k = ind['stoch_k']
         
         # Determine overall signal
         signals = []
         
         # RSI signals
-        if get_last(rsi_14) < 30:
+        if rsi_14 < 30:
             signals.append('RSI_OVERSOLD')
-        elif get_last(rsi_14) > 70:
+        elif rsi_14 > 70:
             signals.append('RSI_OVERBOUGHT')
         
         # MACD signals
-        if get_last(macd) > get_last(macd_signal):
-            signals.append('MACD_BULLISH')
-        else:
-            signals.append('MACD_BEARISH')
+        signals.append('MACD_' + macd_trend)
         
         # ADX signals (trend strength)
-        adx_value = get_last(adx)
-        if adx_value and adx_value > 25:
+        if strong_trend:
             signals.append('STRONG_TREND')
         elif adx_value and adx_value < 20:
             signals.append('WEAK_TREND')
         
         # Bollinger Bands signals
-        current_price = prices[-1]
-        if current_price < get_last(bb_lower):
+        if current_price < bb_lower:
             signals.append('BB_OVERSOLD')
-        elif current_price > get_last(bb_upper):
+        elif current_price > bb_upper:
             signals.append('BB_OVERBOUGHT')
         
-        return {
+        result = {
             'success': True,
             'indicators': {
                 'rsi': {
-                    'rsi_14': get_last(rsi_14),
-                    'rsi_7': get_last(rsi_7),
-                    'rsi_21': get_last(rsi_21)
+                    'rsi_14': rsi_14,
+                    'rsi_7': ind['rsi_7'],
+                    'rsi_21': ind['rsi_21']
                 },
                 'macd': {
-                    'macd': get_last(macd),
-                    'signal': get_last(macd_signal),
-                    'histogram': get_last(macd_hist),
-                    'trend': 'BULLISH' if get_last(macd) > get_last(macd_signal) else 'BEARISH'
+                    'macd': ind['macd'],
+                    'signal': ind['macd_signal'],
+                    'histogram': ind['macd_hist'],
+                    'trend': macd_trend
                 },
                 'bollinger': {
-                    'upper': get_last(bb_upper),
-                    'middle': get_last(bb_middle),
-                    'lower': get_last(bb_lower),
-                    'position': calculate_bb_position(current_price, get_last(bb_upper), get_last(bb_lower))
+                    'upper': bb_upper,
+                    'middle': ind['bb_middle'],
+                    'lower': bb_lower,
+                    'position': calculate_bb_position(current_price, bb_upper, bb_lower)
                 },
                 'adx': {
-                    'value': get_last(adx),
-                    'strength': 'STRONG' if adx_value and adx_value > 25 else 'WEAK'
+                    'value': adx_value,
+                    'strength': 'STRONG' if strong_trend else 'WEAK'
                 },
                 'stochastic': {
-                    'k': get_last(slowk),
-                    'd': get_last(slowd),
-                    'signal': 'OVERSOLD' if get_last(slowk) < 20 else 'OVERBOUGHT' if get_last(slowk) > 80 else 'NEUTRAL'
+                    'k': stoch_k,
+                    'd': ind['stoch_d'],
+                    'signal': 'OVERSOLD' if stoch_k < 20 else 'OVERBOUGHT' if stoch_k > 80 else 'NEUTRAL'
                 },
                 'atr': {
-                    'value': get_last(atr),
-                    'volatility': 'HIGH' if get_last(atr) > prices[-1] * 0.05 else 'LOW'
+                    'value': ind['atr'],
+                    'volatility': 'HIGH' if ind['atr'] > current_price * 0.05 else 'LOW'
                 },
-                'obv': get_last(obv),
-                'williams_r': get_last(willr),
-                'cci': get_last(cci),
-                'mfi': get_last(mfi),
+                'obv': ind['obv'],
+                'williams_r': ind['williams_r'],
+                'cci': ind['cci'],
+                'mfi': ind['mfi'],
                 'moving_averages': {
-                    'sma_20': get_last(sma_20),
-                    'sma_50': get_last(sma_50),
-                    'ema_12': get_last(ema_12),
-                    'ema_26': get_last(ema_26),
-                    'trend': 'BULLISH' if get_last(sma_20) > get_last(sma_50) else 'BEARISH'
+                    'sma_20': ind['sma_20'],
+                    'sma_50': ind['sma_50'],
+                    'ema_12': ind['ema_12'],
+                    'ema_26': ind['ema_26'],
+                    'trend': 'BULLISH' if ind['sma_20'] > ind['sma_50'] else 'BEARISH'
                 },
-                'sar': get_last(sar)
+                'sar': ind['sar']
             },
             'signals': signals,
             'summary': generate_summary(signals)
         }
         
+        _result_cache[key] = result
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+        return result
+        
     except Exception as e:
         return {
             'success': False,
@@ -221,11 +258,12 @@ def calculate_bb_position(price, upper, lower):
 
 def generate_summary(signals):
     """Generate trading summary from signals"""
-    bullish_signals = ['RSI_OVERSOLD', 'MACD_BULLISH', 'BB_OVERSOLD']
-    bearish_signals = ['RSI_OVERBOUGHT', 'MACD_BEARISH', 'BB_OVERBOUGHT']
+    flags = 0
+    for s in signals:
+        flags |= SIGNAL_BITS.get(s, 0)
     
-    bullish_count = sum(1 for s in signals if s in bullish_signals)
-    bearish_count = sum(1 for s in signals if s in bearish_signals)
+    bullish_count = (flags & BULLISH_MASK).bit_count()
+    bearish_count = (flags & BEARISH_MASK).bit_count()
     
     if bullish_count > bearish_count:
         return {
@@ -247,7 +285,14 @@ def generate_summary(signals):
         }
 
 def main():
-    """Main entry point - reads JSON from stdin, outputs JSON to stdout"""
+    """Main entry point - reads JSON from stdin, outputs JSON to stdout (--serve: NDJSON loop, --binary: framed arrays)"""
+    if '--binary' in sys.argv[1:]:
+        serve_binary(calculate_advanced_indicators)
+        return
+    if '--serve' in sys.argv[1:]:
+        serve(calculate_advanced_indicators)
+        return
+    
     try:
         # Read input from Node.js
         input_data = json.load(sys.stdin)
@@ -256,14 +301,14 @@ def main():
         result = calculate_advanced_indicators(input_data)
         
         # Output JSON to stdout
-        print(json.dumps(result))
+        write_result(result)
         
     except Exception as e:
         error_result = {
             'success': False,
             'error': f'Python analysis failed: {str(e)}'
         }
-        print(json.dumps(error_result))
+        write_result(error_result)
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -1,110 +1,185 @@
 #!/usr/bin/env python3
 """
 Simplified Technical Analysis Service for Render
-Works with just numpy and pandas (no TA-Lib required)
+Works with just numpy (Numba JIT is used when installed)
 """
 
 import sys
 import json
 import numpy as np
-import pandas as pd
+from _njit import njit
+from _kernels import rolling_extrema_tail, specialise
+from _daemon import serve, serve_binary, write_result
 
+# One bit per signal name so signal sets can be counted with popcount
+SIGNAL_BITS = {name: 1 << i for i, name in enumerate((
+    'RSI_OVERSOLD', 'RSI_OVERBOUGHT',
+    'MACD_BULLISH', 'MACD_BEARISH',
+    'BB_OVERSOLD', 'BB_OVERBOUGHT',
+    'TREND_BULLISH', 'TREND_BEARISH'
+))}
+BULLISH_MASK = (SIGNAL_BITS['RSI_OVERSOLD'] | SIGNAL_BITS['MACD_BULLISH'] |
+                SIGNAL_BITS['BB_OVERSOLD'] | SIGNAL_BITS['TREND_BULLISH'])
+BEARISH_MASK = (SIGNAL_BITS['RSI_OVERBOUGHT'] | SIGNAL_BITS['MACD_BEARISH'] |
+                SIGNAL_BITS['BB_OVERBOUGHT'] | SIGNAL_BITS['TREND_BEARISH'])
+
+@njit(cache=True)
 def calculate_rsi(prices, period=14):
-    """Calculate RSI using pandas"""
-    df = pd.DataFrame({'price': prices})
-    delta = df['price'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50.0
+    """Calculate RSI with Wilder's smoothing (running gain/loss averages)"""
+    n = len(prices)
+    if n <= period:
+        return 50.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        change = prices[i] - prices[i - 1]
+        if change > 0:
+            avg_gain += change
+        else:
+            avg_loss -= change
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, n):
+        change = prices[i] - prices[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 50.0 if avg_gain == 0 else 100.0
+    rs = avg_gain / avg_loss
+    return 100.0 - (100.0 / (1.0 + rs))
 
+@njit(cache=True)
 def calculate_sma(prices, period):
     """Calculate Simple Moving Average"""
-    return pd.Series(prices).rolling(window=period).mean().iloc[-1]
+    if len(prices) < period:
+        return np.nan
+    return prices[-period:].mean()
 
+@njit(cache=True)
 def calculate_ema(prices, period):
     """Calculate Exponential Moving Average"""
-    return pd.Series(prices).ewm(span=period, adjust=False).mean().iloc[-1]
-
-def calculate_bollinger_bands(prices, period=20, std_dev=2):
-    """Calculate Bollinger Bands"""
-    sma = pd.Series(prices).rolling(window=period).mean()
-    std = pd.Series(prices).rolling(window=period).std()
-    upper = sma + (std * std_dev)
-    middle = sma
-    lower = sma - (std * std_dev)
-    return {
-        'upper': upper.iloc[-1],
-        'middle': middle.iloc[-1],
-        'lower': lower.iloc[-1]
-    }
+    alpha = 2.0 / (period + 1)
+    ema = prices[0]
+    for i in range(1, len(prices)):
+        ema += alpha * (prices[i] - ema)
+    return ema
+
+@njit(cache=True)
+def calculate_bollinger_bands(prices, period=20, std_dev=2.0):
+    """Calculate Bollinger Bands, returns (upper, middle, lower)"""
+    if len(prices) < period:
+        return np.nan, np.nan, np.nan
+    window = prices[-period:]
+    mean = window.mean()
+    # Sample std (ddof=1); numba's ndarray.std() has no ddof argument
+    std = window.std() * np.sqrt(period / (period - 1))
+    return mean + std * std_dev, mean, mean - std * std_dev
 
+@njit(cache=True)
 def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """Calculate MACD"""
-    ema_fast = pd.Series(prices).ewm(span=fast, adjust=False).mean()
-    ema_slow = pd.Series(prices).ewm(span=slow, adjust=False).mean()
+    """Calculate MACD, returns (macd, signal, histogram)"""
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    ema_fast = prices[0]
+    ema_slow = prices[0]
+    signal_line = 0.0
+    for i in range(1, len(prices)):
+        ema_fast += alpha_fast * (prices[i] - ema_fast)
+        ema_slow += alpha_slow * (prices[i] - ema_slow)
+        signal_line += alpha_signal * ((ema_fast - ema_slow) - signal_line)
     macd_line = ema_fast - ema_slow
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-    histogram = macd_line - signal_line
-    return {
-        'macd': macd_line.iloc[-1],
-        'signal': signal_line.iloc[-1],
-        'histogram': histogram.iloc[-1]
-    }
-
-def calculate_stochastic(highs, lows, closes, period=14):
-    """Calculate Stochastic Oscillator"""
-    high_roll = pd.Series(highs).rolling(window=period).max()
-    low_roll = pd.Series(lows).rolling(window=period).min()
-    
-    k = 100 * (closes - low_roll) / (high_roll - low_roll)
-    d = k.rolling(window=3).mean()
-    
-    return {
-        'k': k.iloc[-1] if not pd.isna(k.iloc[-1]) else 50.0,
-        'd': d.iloc[-1] if not pd.isna(d.iloc[-1]) else 50.0
-    }
+    return macd_line, signal_line, macd_line - signal_line
 
+@njit(cache=True)
+def calculate_stochastic(highs, lows, closes, period=14, smooth=3):
+    """Calculate Stochastic Oscillator, returns (k, d)"""
+    n = len(closes)
+    if n < period + smooth - 1:
+        return 50.0, 50.0
+    high_max, low_min = rolling_extrema_tail(highs, lows, period, smooth)
+    k = np.nan
+    k_total = 0.0
+    for j in range(smooth):
+        if high_max[j] == low_min[j]:
+            k = np.nan
+        else:
+            k = 100.0 * (closes[n - smooth + j] - low_min[j]) / (high_max[j] - low_min[j])
+        k_total += k
+    d = k_total / smooth
+    return (50.0 if np.isnan(k) else k), (50.0 if np.isnan(d) else d)
+
+@njit(cache=True)
 def calculate_atr(highs, lows, closes, period=14):
     """Calculate Average True Range"""
-    high = pd.Series(highs)
-    low = pd.Series(lows)
-    close = pd.Series(closes)
-    
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
-    
-    return atr.iloc[-1] if not pd.isna(atr.iloc[-1]) else 0.0
+    n = len(closes)
+    if n < period:
+        return 0.0
+    start = n - period
+    high = highs[start:]
+    low = lows[start:]
+    # Previous close per bar (the very first bar falls back to its own close)
+    prev_close = np.empty(period)
+    prev_close[0] = closes[start - 1] if start > 0 else closes[0]
+    prev_close[1:] = closes[start:n - 1]
+    tr = np.maximum(high - low,
+                    np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return tr.mean()
+
+# Fixed-period builds of the kernels above, with parameters compiled in as constants
+calculate_rsi_14 = specialise(calculate_rsi, 14)
+calculate_rsi_7 = specialise(calculate_rsi, 7)
+calculate_rsi_21 = specialise(calculate_rsi, 21)
+calculate_bollinger_bands_20 = specialise(calculate_bollinger_bands, 20, 2.0)
+calculate_macd_12_26_9 = specialise(calculate_macd, 12, 26, 9)
+calculate_stochastic_14_3 = specialise(calculate_stochastic, 14, 3)
+calculate_atr_14 = specialise(calculate_atr, 14)
+calculate_sma_20 = specialise(calculate_sma, 20)
+calculate_sma_50 = specialise(calculate_sma, 50)
+calculate_ema_12 = specialise(calculate_ema, 12)
+calculate_ema_26 = specialise(calculate_ema, 26)
+
+@njit(cache=True)
+def compute_all(prices, highs, lows):
+    """Calculate every indicator in a single JIT dispatch"""
+    bb_upper, bb_middle, bb_lower = calculate_bollinger_bands_20(prices)
+    macd, macd_signal, macd_hist = calculate_macd_12_26_9(prices)
+    stoch_k, stoch_d = calculate_stochastic_14_3(highs, lows, prices)
+    return (calculate_rsi_14(prices), calculate_rsi_7(prices), calculate_rsi_21(prices),
+            bb_upper, bb_middle, bb_lower,
+            macd, macd_signal, macd_hist,
+            stoch_k, stoch_d, calculate_atr_14(highs, lows, prices),
+            calculate_sma_20(prices), calculate_sma_50(prices),
+            calculate_ema_12(prices), calculate_ema_26(prices))
+
+# Prefer the ahead-of-time compiled compute_all (built by _kernels_aot.py)
+try:
+    from ta_kernels import simple_compute_all as compute_all_native
+except ImportError:
+    compute_all_native = compute_all
 
 def analyze_data(data):
     """Main analysis function"""
     try:
-        prices = np.array(data.get('prices', []), dtype=float)
-        highs = np.array(data.get('highs', prices), dtype=float)
-        lows = np.array(data.get('lows', prices), dtype=float)
+        prices = np.asarray(data.get('prices', []), dtype=float)
+        highs = np.asarray(data.get('highs', prices), dtype=float)
+        lows = np.asarray(data.get('lows', prices), dtype=float)
         
         if len(prices) < 30:
             return {'success': False, 'error': 'Need at least 30 data points'}
         
-        # Calculate indicators
-        rsi_14 = calculate_rsi(prices, 14)
-        rsi_7 = calculate_rsi(prices, 7)
-        rsi_21 = calculate_rsi(prices, 21)
-        
-        bb = calculate_bollinger_bands(prices)
-        macd_data = calculate_macd(prices)
-        stoch = calculate_stochastic(highs, lows, prices)
-        atr = calculate_atr(highs, lows, prices, 14)
+        # The kernels index highs/lows up to len(prices) without bounds checks
+        if not len(highs) == len(lows) == len(prices):
+            return {'success': False, 'error': 'prices, highs and lows must have the same length'}
         
-        sma_20 = calculate_sma(prices, 20)
-        sma_50 = calculate_sma(prices, 50)
-        ema_12 = calculate_ema(prices, 12)
-        ema_26 = calculate_ema(prices, 26)
+        # Calculate indicators
+        (rsi_14, rsi_7, rsi_21,
+         bb_upper, bb_middle, bb_lower,
+         macd, macd_signal, macd_hist,
+         stoch_k, stoch_d, atr,
+         sma_20, sma_50, ema_12, ema_26) = compute_all_native(prices, highs, lows)
         
         # Calculate signals
         signals = []
@@ -114,15 +189,15 @@ def analyze_data(data):
         elif rsi_14 > 70:
             signals.append('RSI_OVERBOUGHT')
         
-        if macd_data['macd'] > macd_data['signal']:
+        if macd > macd_signal:
             signals.append('MACD_BULLISH')
         else:
             signals.append('MACD_BEARISH')
         
         current_price = prices[-1]
-        if current_price < bb['lower']:
+        if current_price < bb_lower:
             signals.append('BB_OVERSOLD')
-        elif current_price > bb['upper']:
+        elif current_price > bb_upper:
             signals.append('BB_OVERBOUGHT')
         
         if sma_20 > sma_50:
@@ -131,11 +206,12 @@ def analyze_data(data):
             signals.append('TREND_BEARISH')
         
         # Generate summary
-        bullish_signals = ['RSI_OVERSOLD', 'MACD_BULLISH', 'BB_OVERSOLD', 'TREND_BULLISH']
-        bearish_signals = ['RSI_OVERBOUGHT', 'MACD_BEARISH', 'BB_OVERBOUGHT', 'TREND_BEARISH']
+        flags = 0
+        for s in signals:
+            flags |= SIGNAL_BITS[s]
         
-        bullish_count = sum(1 for s in signals if s in bullish_signals)
-        bearish_count = sum(1 for s in signals if s in bearish_signals)
+        bullish_count = (flags & BULLISH_MASK).bit_count()
+        bearish_count = (flags & BEARISH_MASK).bit_count()
         
         if bullish_count > bearish_count:
             action = 'BUY'
@@ -151,36 +227,36 @@ def analyze_data(data):
             'success': True,
             'indicators': {
                 'rsi': {
-                    'rsi_14': float(rsi_14),
-                    'rsi_7': float(rsi_7),
-                    'rsi_21': float(rsi_21)
+                    'rsi_14': rsi_14,
+                    'rsi_7': rsi_7,
+                    'rsi_21': rsi_21
                 },
                 'macd': {
-                    'macd': float(macd_data['macd']),
-                    'signal': float(macd_data['signal']),
-                    'histogram': float(macd_data['histogram']),
-                    'trend': 'BULLISH' if macd_data['macd'] > macd_data['signal'] else 'BEARISH'
+                    'macd': macd,
+                    'signal': macd_signal,
+                    'histogram': macd_hist,
+                    'trend': 'BULLISH' if macd > macd_signal else 'BEARISH'
                 },
                 'bollinger': {
-                    'upper': float(bb['upper']),
-                    'middle': float(bb['middle']),
-                    'lower': float(bb['lower']),
-                    'position': calculate_bb_position(current_price, bb['upper'], bb['lower'])
+                    'upper': bb_upper,
+                    'middle': bb_middle,
+                    'lower': bb_lower,
+                    'position': calculate_bb_position(current_price, bb_upper, bb_lower)
                 },
                 'stochastic': {
-                    'k': float(stoch['k']),
-                    'd': float(stoch['d']),
-                    'signal': 'OVERSOLD' if stoch['k'] < 20 else 'OVERBOUGHT' if stoch['k'] > 80 else 'NEUTRAL'
+                    'k': stoch_k,
+                    'd': stoch_d,
+                    'signal': 'OVERSOLD' if stoch_k < 20 else 'OVERBOUGHT' if stoch_k > 80 else 'NEUTRAL'
                 },
                 'atr': {
-                    'value': float(atr),
+                    'value': atr,
                     'volatility': 'HIGH' if atr > current_price * 0.05 else 'MEDIUM' if atr > current_price * 0.02 else 'LOW'
                 },
                 'moving_averages': {
-                    'sma_20': float(sma_20),
-                    'sma_50': float(sma_50),
-                    'ema_12': float(ema_12),
-                    'ema_26': float(ema_26),
+                    'sma_20': sma_20,
+                    'sma_50': sma_50,
+                    'ema_12': ema_12,
+                    'ema_26': ema_26,
                     'trend': 'BULLISH' if sma_20 > sma_50 else 'BEARISH'
                 }
             },
@@ -211,17 +287,24 @@ def calculate_bb_position(price, upper, lower):
         return 'MIDDLE'
 
 def main():
-    """Main entry point"""
+    """Main entry point (--serve / --binary keep the process alive for NDJSON or framed requests)"""
+    if '--binary' in sys.argv[1:]:
+        serve_binary(analyze_data)
+        return
+    if '--serve' in sys.argv[1:]:
+        serve(analyze_data)
+        return
+    
     try:
         input_data = json.load(sys.stdin)
         result = analyze_data(input_data)
-        print(json.dumps(result))
+        write_result(result)
     except Exception as e:
         error_result = {
             'success': False,
             'error': f'Python analysis failed: {str(e)}'
         }
-        print(json.dumps(error_result))
+        write_result(error_result)
         sys.exit(1)
 
 if __name__ == '__main__':
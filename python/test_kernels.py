@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Parity check: advanced_analysis.compute_all vs TA-Lib
+Compares every INDICATORS_DT field against the matching talib function on
+random OHLCV series of several lengths. Needs TA-Lib installed:
+
+    cd python && python3 test_kernels.py
+"""
+
+import sys
+import numpy as np
+
+try:
+    import talib
+except ImportError:
+    print('⚠️ TA-Lib not installed - nothing to compare against')
+    sys.exit(0)
+
+from advanced_analysis import compute_all, INDICATORS_DT
+
+LENGTHS = (30, 35, 50, 500)
+SERIES_PER_LENGTH = 20
+
+def talib_last(prices, highs, lows, volumes):
+    """Last value of each INDICATORS_DT field computed with TA-Lib"""
+    macd, macd_signal, macd_hist = talib.MACD(prices, 12, 26, 9)
+    bb_upper, bb_middle, bb_lower = talib.BBANDS(prices, 20, 2.0, 2.0, 0)
+    stoch_k, stoch_d = talib.STOCH(highs, lows, prices, 14, 3, 0, 3, 0)
+    expected = {
+        'rsi_14': talib.RSI(prices, 14),
+        'rsi_7': talib.RSI(prices, 7),
+        'rsi_21': talib.RSI(prices, 21),
+        'macd': macd,
+        'macd_signal': macd_signal,
+        'macd_hist': macd_hist,
+        'bb_upper': bb_upper,
+        'bb_middle': bb_middle,
+        'bb_lower': bb_lower,
+        'adx': talib.ADX(highs, lows, prices, 14),
+        'stoch_k': stoch_k,
+        'stoch_d': stoch_d,
+        'atr': talib.ATR(highs, lows, prices, 14),
+        'obv': talib.OBV(prices, volumes),
+        'williams_r': talib.WILLR(highs, lows, prices, 14),
+        'cci': talib.CCI(highs, lows, prices, 14),
+        'mfi': talib.MFI(highs, lows, prices, volumes, 14),
+        'sma_20': talib.SMA(prices, 20),
+        'sma_50': talib.SMA(prices, 50),
+        'ema_12': talib.EMA(prices, 12),
+        'ema_26': talib.EMA(prices, 26),
+        'sar': talib.SAR(highs, lows, acceleration=0.02, maximum=0.2),
+    }
+    return {name: values[-1] for name, values in expected.items()}
+
+def random_ohlcv(rng, n, rounded):
+    """Random-walk closes with highs/lows around them (rounded to force ties)"""
+    prices = 100 + np.cumsum(rng.normal(size=n))
+    highs = prices + rng.uniform(0, 2, n)
+    lows = prices - rng.uniform(0, 2, n)
+    volumes = rng.uniform(1, 1000, n)
+    if rounded:
+        prices, highs, lows = np.round(prices), np.round(highs), np.round(lows)
+    return prices, highs, lows, volumes
+
+def main():
+    rng = np.random.default_rng(42)
+    failures = {}
+    for n in LENGTHS:
+        for i in range(SERIES_PER_LENGTH):
+            series = random_ohlcv(rng, n, rounded=i % 4 == 0)
+            actual = compute_all(*series).view(INDICATORS_DT)[0]
+            for name, want in talib_last(*series).items():
+                got = actual[name]
+                same_nan = np.isnan(want) and np.isnan(got)
+                if not same_nan and not np.isclose(got, want, rtol=1e-9, atol=1e-9):
+                    failures.setdefault(name, []).append((n, want, got))
+
+    print('=== compute_all vs TA-Lib ===\n')
+    for name in INDICATORS_DT.names:
+        if name in failures:
+            n, want, got = failures[name][0]
+            print(f'❌ {name}: {len(failures[name])} mismatches (e.g. n={n}: talib {want}, kernel {got})')
+        else:
+            print(f'✅ {name}')
+
+    if failures:
+        sys.exit(1)
+    print(f'\nAll fields match for lengths {LENGTHS}')
+
+if __name__ == '__main__':
+    main()
@@ -29,8 +29,8 @@ if command -v python3 &> /dev/null; then
                 
                 # Try individual installs
                 $PIP_CMD install --user "numpy>=1.24.0,<2.0.0" --no-cache-dir || echo "⚠️ numpy failed"
-                $PIP_CMD install --user "pandas>=2.0.0,<3.0.0" --no-cache-dir || echo "⚠️ pandas failed"
-                $PIP_CMD install --user "scipy>=1.11.0,<2.0.0" --no-cache-dir || echo "⚠️ scipy failed"
+                $PIP_CMD install --user "numba>=0.58.0" --no-cache-dir || echo "⚠️ numba failed (indicators run without JIT)"
+                $PIP_CMD install --user "orjson>=3.9.0" --no-cache-dir || echo "⚠️ orjson failed (stdlib json is used)"
             }
         else
             echo "⚠️ python/requirements.txt not found"
@@ -39,8 +39,14 @@ if command -v python3 &> /dev/null; then
         # Verify installations
         echo "🔍 Verifying Python packages..."
         python3 -c "import numpy; print(f'  ✅ numpy {numpy.__version__}')" 2>/dev/null || echo "  ⚠️ numpy not available"
-        python3 -c "import pandas; print(f'  ✅ pandas {pandas.__version__}')" 2>/dev/null || echo "  ⚠️ pandas not available"
-        python3 -c "import scipy; print(f'  ✅ scipy {scipy.__version__}')" 2>/dev/null || echo "  ⚠️ scipy not available"
+        python3 -c "import numba; print(f'  ✅ numba {numba.__version__}')" 2>/dev/null || echo "  ⚠️ numba not available (indicators run without JIT)"
+        
+        # Precompile the indicator kernels so requests skip the first-call JIT
+        # (set TA_KERNELS_CPU=x86-64-v3 in the service env to build for AVX2/FMA)
+        echo "⚙️ Building ahead-of-time indicator kernels..."
+        # Start from a clean JIT cache so no stale compiled kernels are linked in
+        rm -rf python/__pycache__
+        (cd python && python3 _kernels_aot.py) || echo "  ⚠️ AOT kernel build failed (kernels will JIT on first use)"
         
         echo "✅ Python setup completed"
     else